@@ -31,34 +31,66 @@ Usage:
 
     # Deploy and specify custom .env path
     ENV_PATH=/path/to/.env modal deploy scripts/chandra_ocr_modal.py
+
+    # Deploy with int8 weight-only quantization
+    CHANDRA_QUANTIZE=int8 modal deploy scripts/chandra_ocr_modal.py
 """
 
 from __future__ import annotations
 
-import json
+import functools
 import os
-import re
-import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import modal
 
+if TYPE_CHECKING:
+    from PIL import Image
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
-# Use centralized config with fallback for Modal remote execution
+# Use centralized config with fallback for Modal remote execution.
+# Resolved lazily so importing this module (every CLI call and container
+# start) does not pay for loading sdk.modal_compat.
+
 
-try:
-    from sdk.modal_compat import get_ocr_model
+@functools.cache
+def _chandra_model() -> str:
+    """Return the Chandra checkpoint name, resolving it on first use."""
+    try:
+        from sdk.modal_compat import get_ocr_model
+
+        return get_ocr_model()
+    except ImportError:
+        return "datalab-to/chandra"
 
-    CHANDRA_MODEL = get_ocr_model()
-except ImportError:
-    CHANDRA_MODEL = "datalab-to/chandra"
 
 # Default .env path for annotator project
 DEFAULT_ENV_PATH = Path(__file__).parent.parent.parent.parent.parent / "annotator" / ".env"
 ENV_VAR_NAME = "OCR_INFERENCE_URL"
 
+# Screenshots larger than this on their long edge are downscaled before OCR.
+# The vision tower downsamples internally anyway; 4K/Retina inputs only cost
+# decode time and attention memory.
+MAX_IMAGE_EDGE = 2048
+
+# File extensions picked up in batch mode (lowercase, no leading dot)
+IMAGE_EXTENSIONS = frozenset({"png", "jpg", "jpeg", "webp", "bmp"})
+
+# Upper bound on parallel A100 containers for batch mode and the endpoint
+MAX_GPU_CONTAINERS = 8
+
+# Weight quantization applied after loading: "none" or "int8" (torchao
+# weight-only). Read at deploy time and baked into the image env, e.g.
+#   CHANDRA_QUANTIZE=int8 modal deploy scripts/chandra_ocr_modal.py
+# Verify CER on a held-out screenshot set before enabling in production.
+CHANDRA_QUANTIZE = os.environ.get("CHANDRA_QUANTIZE", "none")
+if CHANDRA_QUANTIZE not in ("none", "int8"):
+    raise ValueError(f"Unknown CHANDRA_QUANTIZE: {CHANDRA_QUANTIZE!r} (expected none, int8)")
+
 
 # =============================================================================
 # MODAL APP SETUP
@@ -66,6 +98,18 @@ ENV_VAR_NAME = "OCR_INFERENCE_URL"
 
 app = modal.App("chandra-ocr-inference")
 
+# HuggingFace cache inside the image. Weights are downloaded into it at
+# image build time, so every cold start reads them from local disk.
+HF_CACHE_DIR = "/root/.cache/huggingface"
+
+
+def _download_weights() -> None:
+    """Fetch the Chandra checkpoint into HF_HOME (runs once at image build)."""
+    from huggingface_hub import snapshot_download
+
+    snapshot_download(_chandra_model())
+
+
 # Docker image with Chandra OCR dependencies
 image = (
     modal.Image.from_registry(
@@ -79,196 +123,122 @@ image = (
         "Pillow>=10.0.0",
         "chandra-ocr",
         "fastapi",
+        "torchao",
     )
+    .env({"HF_HOME": HF_CACHE_DIR})
+    .run_function(
+        _download_weights,
+        secrets=[modal.Secret.from_name("huggingface-secret")],
+    )
+    # Set after the download so toggling quantization keeps the weights layer
+    .env({"CHANDRA_QUANTIZE": CHANDRA_QUANTIZE})
+)
+
+# Lightweight CPU image for the HTTP front door (no model, no CUDA)
+endpoint_image = modal.Image.debian_slim(python_version="3.11").pip_install(
+    "fastapi[standard]",
+    "pybase64",
 )
 
 
 # =============================================================================
-# INFERENCE FUNCTIONS
+# HELPERS
 # =============================================================================
 
 
-@app.function(
-    image=image,
-    gpu="A100:1",
-    timeout=600,
-    secrets=[modal.Secret.from_name("huggingface-secret")],
-)
-def run_ocr(
-    image_base64: str,
-    prompt_type: str = "ocr_layout",
-    output_format: str = "markdown",
-) -> dict:
-    """
-    Run Chandra OCR on a single image.
+def _decode_image(
+    image_bytes: bytes, max_edge: int = MAX_IMAGE_EDGE
+) -> tuple[Image.Image, tuple[int, int]]:
+    """Decode raw image file contents into an RGB PIL image.
 
-    Args:
-        image_base64: Base64-encoded image data
-        prompt_type: Chandra prompt type:
-            - 'ocr_layout': Preserve layout structure (default)
-            - 'ocr_with_region': Include region coordinates
-            - 'ocr': Simple text extraction
-        output_format: Output format ('markdown', 'json', 'html')
-
-    Returns:
-        dict with keys:
-            - text: Extracted text in requested format
-            - format: Output format used
-            - prompt_type: Prompt type used
-            - image_size: (width, height) tuple
+    Images whose long edge exceeds max_edge are downscaled (aspect ratio
+    preserved). Returns (image, original_size) so callers can map
+    coordinates back to the source resolution.
     """
-    import base64
     from io import BytesIO
 
     from PIL import Image
 
-    print(f"\n{'='*80}")
-    print("Chandra OCR Inference")
-    print(f"Model: {CHANDRA_MODEL}")
-    print(f"{'='*80}\n")
-
-    # Decode image
-    print("Decoding image...")
-    image_data = base64.b64decode(image_base64)
-    pil_image = Image.open(BytesIO(image_data)).convert("RGB")
-    print(f"  Image size: {pil_image.size}")
-
-    # Load Chandra model
-    print("\nLoading Chandra model...")
-    from chandra.model import InferenceManager
-    from chandra.model.schema import BatchInputItem
-
-    manager = InferenceManager(method="hf")
-    print("  Model loaded successfully")
-
-    # Run OCR
-    print(f"\nRunning OCR (prompt_type={prompt_type})...")
-    batch = [BatchInputItem(image=pil_image, prompt_type=prompt_type)]
-    results = manager.generate(batch)
-    result = results[0]
-    print("  OCR complete")
-
-    # Extract output based on format
-    output: dict = {
-        "prompt_type": prompt_type,
-        "image_size": pil_image.size,
-    }
-
-    if output_format == "markdown":
-        output["text"] = result.markdown
-        output["format"] = "markdown"
-    elif output_format == "json":
-        output["text"] = result.json if hasattr(result, "json") else result.markdown
-        output["format"] = "json"
-    elif output_format == "html":
-        output["text"] = result.html if hasattr(result, "html") else result.markdown
-        output["format"] = "html"
-    else:
-        output["text"] = result.markdown
-        output["format"] = "markdown"
-
-    # Preview output
-    print(f"\n{'='*80}")
-    print("Extracted Text Preview:")
-    print(f"{'='*80}\n")
-    preview_len = 2000
-    print(output["text"][:preview_len])
-    if len(output["text"]) > preview_len:
-        print(f"\n... ({len(output['text']) - preview_len} more characters)")
-
-    return output
+    pil_image = Image.open(BytesIO(image_bytes)).convert("RGB")
+    original_size = pil_image.size
+    long_edge = max(original_size)
+    if long_edge > max_edge:
+        scale = max_edge / long_edge
+        # Clamp so very elongated images (e.g. 1x5000) keep at least one pixel
+        new_size = (
+            max(1, int(original_size[0] * scale)),
+            max(1, int(original_size[1] * scale)),
+        )
+        pil_image = pil_image.resize(new_size, Image.LANCZOS)
+    return pil_image, original_size
 
 
-@app.function(
-    image=image,
-    gpu="A100:1",
-    timeout=1800,
-    secrets=[modal.Secret.from_name("huggingface-secret")],
-)
-def batch_ocr(
-    images_base64: list[str],
-    prompt_type: str = "ocr_layout",
-    output_format: str = "markdown",
-) -> list[dict]:
-    """
-    Run Chandra OCR on multiple images in batch.
+def _try_decode_image(
+    image_bytes: bytes, max_edge: int = MAX_IMAGE_EDGE
+) -> tuple[Image.Image, tuple[int, int]] | Exception:
+    """_decode_image, returning the exception instead of raising it."""
+    try:
+        return _decode_image(image_bytes, max_edge)
+    except Exception as e:
+        return e
 
-    More efficient than calling run_ocr multiple times as the model
-    is loaded once and reused.
 
-    Args:
-        images_base64: List of base64-encoded images
-        prompt_type: Chandra prompt type
-        output_format: Output format for all images
+def _decode_images(
+    images_bytes: list[bytes], max_edge: int = MAX_IMAGE_EDGE
+) -> list[tuple[Image.Image, tuple[int, int]] | Exception]:
+    """Decode images in parallel (PIL releases the GIL while decoding).
 
-    Returns:
-        List of dicts with extracted text and metadata
+    Each item is decoded on its own, so one corrupt upload yields an
+    exception in its slot instead of failing the whole batch.
     """
-    import base64
-    from io import BytesIO
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        return list(executor.map(lambda data: _try_decode_image(data, max_edge), images_bytes))
 
-    from PIL import Image
 
+def _load_manager() -> Any:
+    """Load the Chandra inference manager (called once per container)."""
     print(f"\n{'='*80}")
-    print(f"Chandra OCR Batch Processing ({len(images_base64)} images)")
-    print(f"Model: {CHANDRA_MODEL}")
+    print("Loading Chandra OCR Model (cached for container lifetime)")
+    print(f"Model: {_chandra_model()}")
     print(f"{'='*80}\n")
 
-    # Decode all images
-    print("Decoding images...")
-    pil_images = []
-    for i, img_b64 in enumerate(images_base64):
-        image_data = base64.b64decode(img_b64)
-        pil_image = Image.open(BytesIO(image_data)).convert("RGB")
-        pil_images.append(pil_image)
-        print(f"  [{i+1}/{len(images_base64)}] Size: {pil_image.size}")
-
-    # Load Chandra model
-    print("\nLoading Chandra model...")
     from chandra.model import InferenceManager
-    from chandra.model.schema import BatchInputItem
 
     manager = InferenceManager(method="hf")
-    print("  Model loaded successfully")
-
-    # Run OCR on batch
-    print(f"\nRunning batch OCR (prompt_type={prompt_type})...")
-    batch = [BatchInputItem(image=img, prompt_type=prompt_type) for img in pil_images]
-    results = manager.generate(batch)
-    print("  Batch OCR complete")
-
-    # Format outputs
-    outputs = []
-    for i, result in enumerate(results):
-        text = result.markdown
-        if output_format == "json" and hasattr(result, "json"):
-            text = result.json
-        elif output_format == "html" and hasattr(result, "html"):
-            text = result.html
-
-        outputs.append({
-            "index": i,
-            "text": text,
-            "format": output_format,
-            "image_size": pil_images[i].size,
-            "prompt_type": prompt_type,
-        })
 
-    print(f"\nProcessed {len(outputs)} images")
-    return outputs
+    if CHANDRA_QUANTIZE == "int8":
+        # Decode is HBM-bandwidth bound; int8 weights halve the bytes moved
+        from torchao.quantization import int8_weight_only, quantize_
+
+        quantize_(manager.model, int8_weight_only())
+        print("Applied int8 weight-only quantization")
+
+    print("Model loaded and cached!")
+    return manager
+
+
+def _extract_text(result: Any, output_format: str) -> tuple[str, str]:
+    """Pick the text for the requested format from a Chandra result.
+
+    Falls back to markdown when the result does not carry the requested
+    format. Returns (text, format_used).
+    """
+    if output_format in ("json", "html") and hasattr(result, output_format):
+        return getattr(result, output_format) or "", output_format
+    return result.markdown or "", "markdown"
 
 
 # =============================================================================
-# WEB ENDPOINT (for deployment) - Uses class for model caching
+# INFERENCE CLASS - model is loaded once per container and reused
 # =============================================================================
 
 
 @app.cls(
     image=image,
     gpu="A100:1",
-    timeout=300,
+    timeout=600,
     secrets=[modal.Secret.from_name("huggingface-secret")],
-    container_idle_timeout=300,  # Keep container alive for 5 minutes
+    scaledown_window=300,  # Keep container alive for 5 minutes
 )
 class ChandraOCR:
     """Chandra OCR inference class with model caching."""
@@ -276,78 +246,178 @@ class ChandraOCR:
     @modal.enter()
     def load_model(self):
         """Load model once when container starts."""
-        print(f"\n{'='*80}")
-        print("Loading Chandra OCR Model (cached for container lifetime)")
-        print(f"Model: {CHANDRA_MODEL}")
-        print(f"{'='*80}\n")
+        self.manager = _load_manager()
+
+    def _ocr(
+        self,
+        pil_image: Image.Image,
+        original_size: tuple[int, int],
+        prompt_type: str,
+        output_format: str,
+    ) -> dict:
+        """Run OCR on one decoded image with the cached model."""
+        from chandra.model.schema import BatchInputItem
 
-        from chandra.model import InferenceManager
+        batch = [BatchInputItem(image=pil_image, prompt_type=prompt_type)]
+        result = self.manager.generate(batch)[0]
+        text, format_used = _extract_text(result, output_format)
 
-        self.manager = InferenceManager(method="hf")
-        print("Model loaded and cached!")
+        return {
+            "text": text,
+            "format": format_used,
+            "prompt_type": prompt_type,
+            "image_size": pil_image.size,
+            "original_size": original_size,
+        }
 
-    @modal.fastapi_endpoint(method="POST")
-    def ocr_endpoint(self, request: dict) -> dict:
+    @modal.method()
+    def run_ocr(
+        self,
+        image_bytes: bytes,
+        prompt_type: str = "ocr_layout",
+        output_format: str = "markdown",
+        max_edge: int = MAX_IMAGE_EDGE,
+    ) -> dict:
         """
-        Web endpoint for OCR inference.
+        Run Chandra OCR on a single image.
 
-        POST body:
-            {
-                "image_base64": "<base64 encoded image>",
-                "prompt_type": "ocr_layout",  # optional
-                "output_format": "markdown"   # optional
-            }
+        Args:
+            image_bytes: Raw encoded image file contents (PNG, JPEG, ...)
+            prompt_type: Chandra prompt type:
+                - 'ocr_layout': Preserve layout structure (default)
+                - 'ocr_with_region': Include region coordinates
+                - 'ocr': Simple text extraction
+            output_format: Output format ('markdown', 'json', 'html')
+            max_edge: Downscale images whose long edge exceeds this
 
         Returns:
-            {
-                "text": "<extracted text>",
-                "format": "markdown",
-                "prompt_type": "ocr_layout",
-                "image_size": [width, height]
-            }
+            dict with keys:
+                - text: Extracted text in requested format
+                - format: Output format used
+                - prompt_type: Prompt type used
+                - image_size: (width, height) seen by the model
+                - original_size: (width, height) of the input image
         """
-        import base64
-        from io import BytesIO
+        pil_image, original_size = _decode_image(image_bytes, max_edge)
+        print(f"Running OCR (prompt_type={prompt_type}, size={pil_image.size})...")
+        output = self._ocr(pil_image, original_size, prompt_type, output_format)
 
-        from chandra.model.schema import BatchInputItem
-        from PIL import Image
+        # Preview output
+        print(f"\n{'='*80}")
+        print("Extracted Text Preview:")
+        print(f"{'='*80}\n")
+        preview_len = 2000
+        print(output["text"][:preview_len])
+        if len(output["text"]) > preview_len:
+            print(f"\n... ({len(output['text']) - preview_len} more characters)")
 
-        image_base64 = request.get("image_base64")
-        if not image_base64:
-            return {"error": "image_base64 is required"}
+        return output
 
-        prompt_type = request.get("prompt_type", "ocr_layout")
-        output_format = request.get("output_format", "markdown")
 
-        # Decode image
-        image_data = base64.b64decode(image_base64)
-        pil_image = Image.open(BytesIO(image_data)).convert("RGB")
+# =============================================================================
+# WEB ENDPOINT (for deployment) - concurrent requests are batched on the GPU
+# =============================================================================
 
-        # Run OCR using cached model
-        batch = [BatchInputItem(image=pil_image, prompt_type=prompt_type)]
-        results = self.manager.generate(batch)
-        result = results[0]
 
-        # Extract output based on format
-        output: dict = {
-            "prompt_type": prompt_type,
-            "image_size": pil_image.size,
+@app.cls(
+    image=image,
+    gpu="A100:1",
+    timeout=300,
+    secrets=[modal.Secret.from_name("huggingface-secret")],
+    max_containers=MAX_GPU_CONTAINERS,
+    scaledown_window=300,  # Keep container alive for 5 minutes
+)
+class ChandraOCRBatched:
+    """Chandra OCR with dynamic request batching.
+
+    Modal coalesces concurrent single-image calls into one list, so
+    simultaneous HTTP requests (and batch-mode .map inputs) share a single
+    manager.generate() pass.
+    A batched method must be the only method on its class, which is why
+    this lives apart from ChandraOCR.
+    """
+
+    @modal.enter()
+    def load_model(self):
+        """Load model once when container starts."""
+        self.manager = _load_manager()
+
+    @modal.batched(max_batch_size=8, wait_ms=50)
+    def ocr(
+        self,
+        images_bytes: list[bytes],
+        prompt_types: list[str],
+        output_formats: list[str],
+    ) -> list[dict]:
+        """
+        Run OCR on a coalesced batch of single-image requests.
+
+        Callers pass one image, prompt type and output format per call;
+        Modal delivers up to max_batch_size of them here as parallel lists.
+        """
+        from chandra.model.schema import BatchInputItem
+
+        decoded = _decode_images(images_bytes)
+        # Requests are unrelated, so a bad image only fails its own call
+        ok = [i for i, item in enumerate(decoded) if not isinstance(item, Exception)]
+        total_pixels = sum(decoded[i][0].width * decoded[i][0].height for i in ok)
+        print(f"Batch of {len(ok)}/{len(decoded)} images, {total_pixels} pixels total")
+        batch = [
+            BatchInputItem(image=decoded[i][0], prompt_type=prompt_types[i]) for i in ok
+        ]
+        results = dict(zip(ok, self.manager.generate(batch))) if batch else {}
+
+        outputs = []
+        for i, item in enumerate(decoded):
+            if isinstance(item, Exception):
+                outputs.append({"error": f"Could not decode image: {item}"})
+                continue
+            pil_image, original_size = item
+            text, format_used = _extract_text(results[i], output_formats[i])
+            outputs.append({
+                "text": text,
+                "format": format_used,
+                "prompt_type": prompt_types[i],
+                "image_size": pil_image.size,
+                "original_size": original_size,
+            })
+        return outputs
+
+
+@app.function(image=endpoint_image, scaledown_window=300)
+@modal.concurrent(max_inputs=32)
+@modal.fastapi_endpoint(method="POST")
+async def ocr_endpoint(request: dict) -> dict:
+    """
+    Web endpoint for OCR inference.
+
+    POST body:
+        {
+            "image_base64": "<base64 encoded image>",
+            "prompt_type": "ocr_layout",  # optional
+            "output_format": "markdown"   # optional
         }
 
-        if output_format == "markdown":
-            output["text"] = result.markdown or ""
-            output["format"] = "markdown"
-        elif output_format == "json":
-            output["text"] = (result.json if hasattr(result, "json") else result.markdown) or ""
-            output["format"] = "json"
-        elif output_format == "html":
-            output["text"] = (result.html if hasattr(result, "html") else result.markdown) or ""
-            output["format"] = "html"
-        else:
-            output["text"] = result.markdown or ""
-            output["format"] = "markdown"
+    Returns:
+        {
+            "text": "<extracted text>",
+            "format": "markdown",
+            "prompt_type": "ocr_layout",
+            "image_size": [width, height],
+            "original_size": [width, height]
+        }
+    """
+    import pybase64
 
-        return output
+    image_base64 = request.get("image_base64")
+    if not image_base64:
+        return {"error": "image_base64 is required"}
+
+    prompt_type = request.get("prompt_type", "ocr_layout")
+    output_format = request.get("output_format", "markdown")
+
+    image_data = pybase64.b64decode(image_base64, validate=False)
+    return await ChandraOCRBatched().ocr.remote.aio(image_data, prompt_type, output_format)
 
 
 # =============================================================================
@@ -366,12 +436,12 @@ def _update_env_file(env_path: Path, var_name: str, value: str) -> None:
             existing_lines = f.readlines()
 
     # Check if variable already exists
-    pattern = re.compile(rf"^{re.escape(var_name)}=")
+    prefix = f"{var_name}="
     found = False
     new_lines: list[str] = []
 
     for line in existing_lines:
-        if pattern.match(line):
+        if line.startswith(prefix):
             new_lines.append(f"{var_name}={value}\n")
             found = True
         else:
@@ -393,32 +463,12 @@ def _update_env_file(env_path: Path, var_name: str, value: str) -> None:
 
 def _get_deployed_url() -> str | None:
     """Get the deployed endpoint URL from Modal."""
+    from modal.exception import NotFoundError
+
     try:
-        result = subprocess.run(
-            ["python3", "-m", "modal", "app", "list"],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        # Look for our app in the output
-        for line in result.stdout.split("\n"):
-            if "chandra-ocr-inference" in line:
-                # App is deployed, get the URL
-                url_result = subprocess.run(
-                    ["python3", "-m", "modal", "app", "show", "chandra-ocr-inference"],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
-                # Parse URL from output
-                for url_line in url_result.stdout.split("\n"):
-                    if "https://" in url_line and "modal.run" in url_line:
-                        # Extract URL
-                        match = re.search(r"(https://[^\s]+\.modal\.run[^\s]*)", url_line)
-                        if match:
-                            return match.group(1)
-        return None
-    except (subprocess.CalledProcessError, FileNotFoundError):
+        endpoint = modal.Function.from_name(app.name, "ocr_endpoint")
+        return endpoint.get_web_url()
+    except NotFoundError:
         return None
 
 
@@ -447,8 +497,6 @@ def main(
         output_format: Output format (markdown, json, html)
         prompt_type: Chandra prompt type (ocr_layout, ocr_with_region, ocr)
     """
-    import base64
-
     if not image and not image_dir:
         print("Error: Either --image or --image-dir is required")
         print("\nUsage:")
@@ -476,11 +524,8 @@ def main(
             return
 
         print(f"Loading image: {image_path}")
-        with open(image_path, "rb") as f:
-            img_base64 = base64.b64encode(f.read()).decode()
-
-        result = run_ocr.remote(
-            image_base64=img_base64,
+        result = ChandraOCR().run_ocr.remote(
+            image_bytes=image_path.read_bytes(),
             prompt_type=prompt_type,
             output_format=output_format,
         )
@@ -488,6 +533,7 @@ def main(
         # Save or print output
         if output:
             _save_result(result, Path(output), output_format)
+            print(f"Saved: {output}")
         else:
             print(f"\n{'='*80}")
             print("Full Extracted Text:")
@@ -501,12 +547,14 @@ def main(
             print(f"Error: Directory not found: {image_dir}")
             return
 
-        # Find all images
-        image_extensions = {".png", ".jpg", ".jpeg", ".webp", ".bmp"}
-        image_files = sorted([
-            f for f in dir_path.iterdir()
-            if f.suffix.lower() in image_extensions
-        ])
+        # Find all images (scandir entries carry cached file-type info)
+        with os.scandir(dir_path) as entries:
+            image_files = sorted(
+                Path(entry.path)
+                for entry in entries
+                if entry.is_file()
+                and os.path.splitext(entry.name)[1][1:].lower() in IMAGE_EXTENSIONS
+            )
 
         if not image_files:
             print(f"No images found in {image_dir}")
@@ -514,37 +562,47 @@ def main(
 
         print(f"Found {len(image_files)} images")
 
-        # Encode all images
-        images_base64 = []
-        for img_file in image_files:
-            with open(img_file, "rb") as f:
-                images_base64.append(base64.b64encode(f.read()).decode())
-
-        # Run batch OCR
-        results = batch_ocr.remote(
-            images_base64=images_base64,
-            prompt_type=prompt_type,
-            output_format=output_format,
+        # Fan images out over the batched class: Modal groups them into
+        # batches of up to 8 and spreads batches across up to
+        # MAX_GPU_CONTAINERS A100s. Files are read lazily as inputs are sent
+        # (raw bytes, no base64 round-trip), so host memory stays bounded.
+        count = len(image_files)
+        results = list(
+            ChandraOCRBatched().ocr.map(
+                (f.read_bytes() for f in image_files),
+                [prompt_type] * count,
+                [output_format] * count,
+            )
         )
+        for i, result in enumerate(results):
+            result["index"] = i
 
         # Save outputs
         if output_dir:
             out_path = Path(output_dir)
             out_path.mkdir(parents=True, exist_ok=True)
 
+            saved = 0
             for i, result in enumerate(results):
+                if "error" in result:
+                    print(f"Skipped {image_files[i].name}: {result['error']}")
+                    continue
                 img_name = image_files[i].stem
                 ext = ".json" if output_format == "json" else ".md"
                 result_path = out_path / f"{img_name}{ext}"
                 _save_result(result, result_path, output_format)
+                saved += 1
 
-            print(f"\nSaved {len(results)} results to {output_dir}")
+            print(f"\nSaved {saved} results to {output_dir}")
         else:
             # Print all results
             for i, result in enumerate(results):
                 print(f"\n{'='*80}")
                 print(f"Image {i+1}: {image_files[i].name}")
                 print(f"{'='*80}\n")
+                if "error" in result:
+                    print(f"Error: {result['error']}")
+                    continue
                 print(result["text"][:1000])
                 if len(result["text"]) > 1000:
                     print(f"\n... ({len(result['text']) - 1000} more characters)")
@@ -552,17 +610,16 @@ def main(
 
 def _save_result(result: dict, output_path: Path, output_format: str) -> None:
     """Save OCR result to file."""
+    import orjson
+
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     if output_format == "json" or output_path.suffix == ".json":
-        with open(output_path, "w") as f:
-            json.dump(result, f, indent=2)
+        output_path.write_bytes(orjson.dumps(result, option=orjson.OPT_INDENT_2))
     else:
         with open(output_path, "w") as f:
             f.write(result["text"])
 
-    print(f"Saved: {output_path}")
-
 
 # =============================================================================
 # POST-DEPLOY HOOK
@@ -22,7 +22,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
-import yaml
+from cudag.core.config import safe_load_yaml
 
 
 @dataclass
@@ -108,7 +108,7 @@ class CanvasConfig:
     def from_yaml(cls, path: Path) -> CanvasConfig:
         """Load canvas configuration from YAML file."""
         with open(path) as f:
-            data = yaml.safe_load(f)
+            data = safe_load_yaml(f)
         return cls.from_dict(data)
 
     @classmethod
@@ -11,6 +11,15 @@ from typing import Any
 
 import yaml
 
+# libyaml's C loader when PyYAML was built with it (same safe-load semantics,
+# several times faster); the pure-Python SafeLoader otherwise
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def safe_load_yaml(stream: Any) -> Any:
+    """yaml.safe_load() using the C-accelerated loader when available."""
+    return yaml.load(stream, Loader=_SafeLoader)
+
 
 def load_yaml_config(
     config_path: Path | str | None = None,
@@ -43,7 +52,7 @@ def load_yaml_config(
         path = Path(config_dir) / default_filename
 
     with open(path) as f:
-        result: dict[str, Any] = yaml.safe_load(f)
+        result: dict[str, Any] = safe_load_yaml(f)
         return result
 
 
@@ -10,16 +10,36 @@ to produce JSONL training datasets.
 
 from __future__ import annotations
 
+import functools
+import hashlib
 import json
+import os
+import queue
 import random
+import threading
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
+from types import TracebackType
 from typing import Any, Callable
 
+import orjson
+from PIL import Image, ImageDraw, ImageFont
+
 from cudag.core.coords import normalize_coord
 from cudag.core.task import BaseTask, TaskContext, TaskSample, TestCase
-from cudag.prompts.tools import format_tool_call
+from cudag.prompts.tools import ToolCall, _format_tool_call_direct, format_tool_call
+
+# One record per line; metadata may carry non-string keys (json.dumps coerced them)
+_JSONL_OPTIONS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+
+# Records are small and written one at a time; a large buffer batches them
+# into ~1 MiB writes instead of one syscall per default 8 KiB block
+_WRITE_BUFFER_SIZE = 1 << 20
 
 
 @dataclass
@@ -56,6 +76,9 @@ class DatasetConfig:
     held_out_ratio: float = 0.1
     """Fraction of samples to hold out."""
 
+    workers: int = 1
+    """Worker processes for sample generation (1 = generate in-process)."""
+
     test_count: int = 100
     """Number of test cases to generate PER TASK TYPE."""
 
@@ -129,10 +152,10 @@ class DatasetConfig:
     @classmethod
     def from_yaml(cls, path: Path) -> DatasetConfig:
         """Load config from YAML file."""
-        import yaml
+        from cudag.core.config import safe_load_yaml
 
         with open(path) as f:
-            data = yaml.safe_load(f)
+            data = safe_load_yaml(f)
 
         return cls(
             name_prefix=data.get("name_prefix", "dataset"),
@@ -145,6 +168,7 @@ class DatasetConfig:
             image_quality=data.get("output", {}).get("image_quality", 95),
             held_out_enabled=data.get("held_out", {}).get("enabled", False),
             held_out_ratio=data.get("held_out", {}).get("ratio", 0.1),
+            workers=data.get("workers", 1),
             test_count=data.get("test", {}).get("count", 100),
             test_distribution=data.get("test", {}).get("distribution", {}),
             test_tolerance=_parse_tolerance(data.get("test", {}).get("tolerance", [10, 10])),
@@ -155,6 +179,242 @@ class DatasetConfig:
         )
 
 
+# Indices submitted per worker ahead of the consumer in parallel build()
+_IN_FLIGHT_PER_WORKER = 4
+
+# Builder for the current worker process, set once by _init_worker
+_worker_builder: DatasetBuilder | None = None
+
+
+def _init_worker(builder: DatasetBuilder) -> None:
+    """Store the builder in a worker process so tasks are pickled only once."""
+    global _worker_builder
+    _worker_builder = builder
+
+
+def _bounded_map(
+    executor: ProcessPoolExecutor,
+    fn: Callable[[Any], Any],
+    jobs: Iterable[Any],
+    max_in_flight: int,
+) -> Iterator[Any]:
+    """Like executor.map, but with at most max_in_flight jobs submitted at once.
+
+    executor.map submits every job up front, so results pile up in memory
+    whenever the consumer falls behind. Here a job is only submitted as an
+    earlier result is taken; results are yielded in job order.
+    """
+    jobs = iter(jobs)
+    pending: deque[Future[Any]] = deque()
+    try:
+        for job in jobs:
+            pending.append(executor.submit(fn, job))
+            if len(pending) >= max_in_flight:
+                break
+        while pending:
+            result = pending.popleft().result()
+            # Refill before handing the result over so workers stay busy
+            job = next(jobs, None)
+            if job is not None:
+                pending.append(executor.submit(fn, job))
+            yield result
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _generate_index(job: tuple[str, int, int]) -> list[tuple[str, bytes]]:
+    """Worker entry point for DatasetBuilder._generate_index."""
+    assert _worker_builder is not None
+    return _worker_builder._generate_index(*job)
+
+
+class _RecordWriter:
+    """Writes serialized records to data.jsonl and split files on a thread.
+
+    Rendering stays on the caller's thread (or worker processes) while file
+    writes, which release the GIL, overlap with it. A bounded queue keeps a
+    slow disk from letting pending records pile up in memory.
+    """
+
+    def __init__(self, output_dir: Path, splits: list[str]) -> None:
+        self._data_file = open(output_dir / "data.jsonl", "wb", buffering=_WRITE_BUFFER_SIZE)
+        self._split_files = {
+            split: open(output_dir / f"{split}.jsonl", "wb", buffering=_WRITE_BUFFER_SIZE)
+            for split in splits
+        }
+        self.counts = dict.fromkeys(splits, 0)
+        self._queue: queue.Queue[list[tuple[str, bytes]] | None] = queue.Queue(maxsize=1024)
+        self._error: Exception | None = None
+        self._thread = threading.Thread(target=self._run, name="jsonl-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, lines: list[tuple[str, bytes]]) -> None:
+        """Queue (split, line) pairs for one index."""
+        if self._error is not None:
+            raise self._error
+        self._queue.put(lines)
+
+    def close(self) -> None:
+        """Drain the queue, close the files and re-raise any write error."""
+        self._queue.put(None)
+        self._thread.join()
+        self._data_file.close()
+        for f in self._split_files.values():
+            f.close()
+        if self._error is not None:
+            raise self._error
+
+    def _run(self) -> None:
+        while (lines := self._queue.get()) is not None:
+            # After a failure keep consuming so put() never blocks on a full queue
+            if self._error is not None:
+                continue
+            try:
+                for split, line in lines:
+                    self._data_file.write(line)
+                    self._split_files[split].write(line)
+                    self.counts[split] += 1
+            except Exception as e:
+                self._error = e
+
+
+class _JsonArrayWriter:
+    """Streams records into a pretty-printed JSON array file.
+
+    The output is byte-identical to orjson.dumps(records, option=OPT_INDENT_2),
+    but only one record is held in memory at a time.
+    """
+
+    _OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._file = open(path, "wb", buffering=_WRITE_BUFFER_SIZE)
+        self._empty = True
+
+    def __enter__(self) -> _JsonArrayWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, record: dict[str, Any]) -> None:
+        """Append one record to the array."""
+        self._file.write(b"[\n  " if self._empty else b",\n  ")
+        # orjson escapes newlines inside strings, so every raw newline is layout
+        self._file.write(orjson.dumps(record, option=self._OPTIONS).replace(b"\n", b"\n  "))
+        self._empty = False
+
+    def close(self) -> None:
+        """Terminate the array and close the file."""
+        self._file.write(b"[]" if self._empty else b"\n]")
+        self._file.close()
+
+    def abort(self) -> None:
+        """Close and remove the file so a partial array is never left behind."""
+        self._file.close()
+        self._path.unlink(missing_ok=True)
+
+
+def _annotation_key(test_case: TestCase) -> str:
+    """Group key for test annotations: task type, plus element_label for grounding."""
+    task_type: str = test_case.metadata.get("task_type", "unknown")
+    if task_type == "grounding":
+        element_label = test_case.metadata.get("element_label", "unknown")
+        return f"grounding:{element_label}"
+    return task_type
+
+
+def _relative_path(path: Path, base: Path) -> str:
+    """str(path.relative_to(base)) via a string prefix check.
+
+    Images are always written under base, so slicing the string avoids
+    PurePath.relative_to's per-part walk. Anything else falls back to
+    relative_to, which raises as before.
+    """
+    path_str = str(path)
+    prefix = f"{base}{os.sep}"
+    if path_str.startswith(prefix):
+        return path_str[len(prefix) :]
+    return str(path.relative_to(base))
+
+
+def _generate_test_index(
+    job: tuple[str, int, int, Path],
+) -> list[tuple[dict[str, Any], TestCase]]:
+    """Worker entry point for DatasetBuilder._generate_test_index."""
+    assert _worker_builder is not None
+    return _worker_builder._generate_test_index(*job)
+
+
+def _annotate(kwargs: dict[str, Any]) -> Path:
+    """Worker entry point for annotate_test_image."""
+    return annotate_test_image(**kwargs)
+
+
+def _run_annotations(jobs: list[dict[str, Any]], workers: int) -> None:
+    """Run annotate_test_image for each job, in worker processes if configured."""
+    # Annotation is PIL drawing/encoding that mostly holds the GIL, so it
+    # goes to worker processes rather than threads
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            # Drain the iterator so worker exceptions propagate
+            list(executor.map(_annotate, jobs))
+    else:
+        for job in jobs:
+            _annotate(job)
+
+
+def _annotation_job(
+    test_case: TestCase, expected_action: dict[str, Any], annotated_dir: Path
+) -> dict[str, Any]:
+    """Keyword arguments for annotate_test_image for one test case."""
+    # Get pixel coordinates for crosshair
+    pixel_coords = test_case.pixel_coords or (0, 0)
+
+    # Build tool_calls list from expected_action and any additional actions
+    tool_calls = [expected_action]
+
+    # Check for additional tool calls in metadata (e.g., type action for textfields)
+    if "additional_tool_calls" in test_case.metadata:
+        tool_calls.extend(test_case.metadata["additional_tool_calls"])
+
+    # Generate annotated image - include task type in filename
+    task_type = test_case.metadata.get("task_type", "unknown")
+    # For grounding, include element_label in filename
+    if task_type == "grounding":
+        element_label = test_case.metadata.get("element_label", "unknown")
+        annotated_path = (
+            annotated_dir / f"{task_type}_{element_label}_{test_case.test_id}_annotated.png"
+        )
+    else:
+        annotated_path = annotated_dir / f"{task_type}_{test_case.test_id}_annotated.png"
+
+    # Extract bbox_pixels for grounding tasks (format: [x, y, width, height])
+    bbox_pixels = None
+    if "bbox_pixels" in test_case.metadata:
+        bp = test_case.metadata["bbox_pixels"]
+        bbox_pixels = (bp[0], bp[1], bp[2], bp[3])
+
+    return {
+        "image_path": test_case.screenshot,
+        "tool_calls": tool_calls,
+        "pixel_coords": pixel_coords,
+        "prompt": test_case.prompt,
+        "output_path": annotated_path,
+        "bbox_pixels": bbox_pixels,
+    }
+
+
 def _parse_tolerance(value: int | list[int]) -> tuple[int, int]:
     """Parse tolerance from config - handles both int and [x, y] formats."""
     if isinstance(value, int):
@@ -196,6 +456,21 @@ def _wrap_text(text: str, font: Any, max_width: int, draw: Any) -> list[str]:
     return lines if lines else [""]
 
 
+@functools.cache
+def _annotation_font() -> Any:
+    """Load the annotation font once per process.
+
+    Tries a monospace font for JSON, then Helvetica, then PIL's default.
+    """
+    try:
+        return ImageFont.truetype("/System/Library/Fonts/Menlo.ttc", 11)
+    except (OSError, IOError):
+        try:
+            return ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 11)
+        except (OSError, IOError):
+            return ImageFont.load_default()
+
+
 def annotate_test_image(
     image_path: Path,
     tool_calls: list[dict[str, Any]],
@@ -224,20 +499,11 @@ def annotate_test_image(
     Returns:
         Path to the annotated image.
     """
-    from PIL import Image, ImageDraw, ImageFont
-
     # Load original image
     original = Image.open(image_path).convert("RGB")
     orig_width, orig_height = original.size
 
-    # Try to load a monospace font for JSON, fall back to default
-    try:
-        font = ImageFont.truetype("/System/Library/Fonts/Menlo.ttc", 11)
-    except (OSError, IOError):
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 11)
-        except (OSError, IOError):
-            font = ImageFont.load_default()
+    font = _annotation_font()
 
     # Create temporary draw to measure text for wrapping
     temp_img = Image.new("RGB", (1, 1))
@@ -373,72 +639,147 @@ class DatasetBuilder:
         output_dir.mkdir(parents=True, exist_ok=True)
         (output_dir / "images").mkdir(exist_ok=True)
 
-        # Generate samples
-        samples: list[dict[str, Any]] = []
-        held_out: list[dict[str, Any]] = []
-        index = 0
+        # Records are streamed straight to disk as they are produced; each one
+        # goes to data.jsonl plus the split file chosen by hashing its id.
+        splits = ["train", "val", "held_out"] if self.config.held_out_enabled else ["train", "val"]
         samples_generated = 0
         last_checkpoint = 0
 
-        for task_type, count in self.config.task_counts.items():
+        for task_type in self.config.task_counts:
             if task_type not in self.tasks:
                 raise ValueError(f"Unknown task type: {task_type}")
 
-            task = self.tasks[task_type]
-            for _ in range(count):
-                # Skip samples until we reach start_index
-                if index < start_index:
-                    index += 1
-                    continue
-
-                ctx = TaskContext(
-                    rng=self.rng,
-                    index=index,
-                    output_dir=output_dir,
-                    config=task.config,
-                    dataset_name=self.config.name_prefix,
+        with ExitStack() as stack:
+            jobs = self._index_jobs(start_index)
+            if self.config.workers > 1:
+                executor = stack.enter_context(
+                    ProcessPoolExecutor(
+                        max_workers=self.config.workers,
+                        initializer=_init_worker,
+                        initargs=(self,),
+                    )
                 )
+                # Runs before the pool's own exit, so an error (e.g. a failed
+                # write or checkpoint) drops queued indices instead of waiting
+                # for them to render
+                stack.callback(executor.shutdown, cancel_futures=True)
+                # Only a few indices per worker are queued ahead of the writer,
+                # so finished records cannot pile up in memory
+                results = _bounded_map(
+                    executor,
+                    _generate_index,
+                    jobs,
+                    self.config.workers * _IN_FLIGHT_PER_WORKER,
+                )
+            else:
+                results = (self._generate_index(*job) for job in jobs)
 
-                # Use generate_samples() for 1:N image-to-samples pattern
-                # A single render can produce multiple training samples
-                task_samples = task.generate_samples(ctx)
-                for sample in task_samples:
-                    record = self._to_record(sample)
-
-                    # Decide if this should be held out
-                    if self.config.held_out_enabled and self.rng.random() < self.config.held_out_ratio:
-                        held_out.append(record)
-                    else:
-                        samples.append(record)
+            # Started after the pool has forked its workers, so no thread is
+            # running when fork() happens
+            writer = _RecordWriter(output_dir, splits)
+            stack.callback(writer.close)
 
-                index += 1
+            for lines in results:
+                writer.put(lines)
                 samples_generated += 1
 
                 # Checkpoint callback
-                if checkpoint_callback and samples_generated - last_checkpoint >= checkpoint_interval:
+                if (
+                    checkpoint_callback
+                    and samples_generated - last_checkpoint >= checkpoint_interval
+                ):
                     checkpoint_callback(samples_generated)
                     last_checkpoint = samples_generated
 
-        # Write data files
-        self._write_jsonl(output_dir / "data.jsonl", samples + held_out)
-        self._write_splits(output_dir, samples)
-
-        if held_out:
-            self._write_jsonl(output_dir / "held_out.jsonl", held_out)
+        counts = writer.counts
+        held_out_count = counts.get("held_out", 0)
+        if self.config.held_out_enabled and held_out_count == 0:
+            (output_dir / "held_out.jsonl").unlink()
 
         # Write config for reference
         self._write_config(output_dir)
 
-        print(f"Generated {len(samples)} training samples, {len(held_out)} held out")
+        print(f"Split: {counts['train']} train, {counts['val']} val")
+        print(
+            f"Generated {counts['train'] + counts['val']} training samples, "
+            f"{held_out_count} held out"
+        )
         print(f"Output: {output_dir}")
 
         return output_dir
 
+    def _index_jobs(self, start_index: int) -> Iterator[tuple[str, int, int]]:
+        """Yield (task_type, index, seed) for every index at or after start_index.
+
+        Seeds are drawn for skipped indices too, so each index always gets the
+        same seed regardless of start_index or worker count.
+        """
+        index = 0
+        for task_type, count in self.config.task_counts.items():
+            for _ in range(count):
+                seed = self.rng.randrange(2**63)
+                if index >= start_index:
+                    yield task_type, index, seed
+                index += 1
+
+    def _generate_index(self, task_type: str, index: int, seed: int) -> list[tuple[str, bytes]]:
+        """Render one index and return its serialized records with their splits."""
+        task = self.tasks[task_type]
+        assert self.config.output_dir is not None
+        ctx = TaskContext(
+            rng=random.Random(seed),
+            index=index,
+            output_dir=self.config.output_dir,
+            config=task.config,
+            dataset_name=self.config.name_prefix,
+        )
+
+        # Use generate_samples() for 1:N image-to-samples pattern
+        # A single render can produce multiple training samples
+        return [
+            (
+                self._split_for(sample.id),
+                orjson.dumps(self._to_record(sample), option=_JSONL_OPTIONS),
+            )
+            for sample in task.generate_samples(ctx)
+        ]
+
+    def _generate_test_index(
+        self, task_type: str, index: int, seed: int, test_dir: Path
+    ) -> list[tuple[dict[str, Any], TestCase]]:
+        """Render one test index and return (record, test case) pairs."""
+        task = self.tasks[task_type]
+        ctx = TaskContext(
+            rng=random.Random(seed),
+            index=index,
+            output_dir=test_dir,
+            config=task.config,
+            dataset_name=self.config.name_prefix,
+        )
+        return [
+            (self._test_to_record(test_case, test_dir), test_case)
+            for test_case in task.generate_tests(ctx)
+        ]
+
+    def _split_for(self, sample_id: str) -> str:
+        """Assign a sample to "held_out", "train" or "val".
+
+        The decision hashes (seed, sample id) rather than drawing from the
+        shared RNG, so it is stable across runs, resumes and generation order.
+        """
+        digest = hashlib.blake2b(f"{self.config.seed}:{sample_id}".encode(), digest_size=8)
+        roll = int.from_bytes(digest.digest(), "big") / 2**64
+
+        held_out_ratio = self.config.held_out_ratio if self.config.held_out_enabled else 0.0
+        if roll < held_out_ratio:
+            return "held_out"
+        # Rescale the remainder to [0, 1) so train_split applies to non-held-out samples
+        if (roll - held_out_ratio) / (1.0 - held_out_ratio) < self.config.train_split:
+            return "train"
+        return "val"
+
     def _to_record(self, sample: TaskSample) -> dict[str, Any]:
         """Convert TaskSample to JSONL record."""
-        # Get normalized coordinates
-        norm_coord = normalize_coord(sample.pixel_coords, sample.image_size)
-
         # Check if sample has multiple tool_calls in metadata
         if "tool_calls" in sample.metadata and len(sample.metadata["tool_calls"]) > 1:
             # Format all tool calls for multi-action samples
@@ -446,16 +787,30 @@ class DatasetBuilder:
             for tc in sample.metadata["tool_calls"]:
                 gpt_parts.append(format_tool_call(tc))
             gpt_value = "\n".join(gpt_parts)
+        elif isinstance(sample.tool_call, ToolCall):
+            # Single tool call - format straight from its fields
+            norm_coord = None
+            if sample.tool_call.coordinate is not None or "coordinate" in sample.tool_call.extra:
+                norm_coord = normalize_coord(sample.pixel_coords, sample.image_size)
+            gpt_value = _format_tool_call_direct(sample.tool_call, norm_coord)
         else:
-            # Single tool call - update with normalized coordinates
+            # Other call types (e.g. get_bbox) - update with normalized coordinates
             tool_call = sample.tool_call.to_dict()
             if "coordinate" in tool_call["arguments"]:
-                tool_call["arguments"]["coordinate"] = list(norm_coord)
+                # Only coordinate actions need normalizing; others skip the math
+                tool_call["arguments"]["coordinate"] = list(
+                    normalize_coord(sample.pixel_coords, sample.image_size)
+                )
             gpt_value = format_tool_call(tool_call)
 
         # Build relative image path
         assert self.config.output_dir is not None
-        image_rel = str(sample.image_path.relative_to(self.config.output_dir))
+        image_rel = _relative_path(sample.image_path, self.config.output_dir)
+
+        # update() keeps task_type/real_coords first and lets sample metadata
+        # fill in (or override) the rest, without an intermediate filtered dict
+        metadata = {"task_type": "unknown", "real_coords": list(sample.pixel_coords)}
+        metadata.update(sample.metadata)
 
         return {
             "id": sample.id,
@@ -464,34 +819,9 @@ class DatasetBuilder:
                 {"from": "human", "value": f"<image>\n{sample.human_prompt}"},
                 {"from": "gpt", "value": gpt_value},
             ],
-            "metadata": {
-                "task_type": sample.metadata.get("task_type", "unknown"),
-                "real_coords": list(sample.pixel_coords),
-                **{k: v for k, v in sample.metadata.items() if k != "task_type"},
-            },
+            "metadata": metadata,
         }
 
-    def _write_jsonl(self, path: Path, records: list[dict[str, Any]]) -> None:
-        """Write records to JSONL file."""
-        with open(path, "w", encoding="utf-8") as f:
-            for record in records:
-                f.write(json.dumps(record) + "\n")
-
-    def _write_splits(self, output_dir: Path, samples: list[dict[str, Any]]) -> None:
-        """Split samples and write train/val files."""
-        # Shuffle for splitting
-        shuffled = samples.copy()
-        self.rng.shuffle(shuffled)
-
-        split_idx = int(len(shuffled) * self.config.train_split)
-        train = shuffled[:split_idx]
-        val = shuffled[split_idx:]
-
-        self._write_jsonl(output_dir / "train.jsonl", train)
-        self._write_jsonl(output_dir / "val.jsonl", val)
-
-        print(f"Split: {len(train)} train, {len(val)} val")
-
     def _write_config(self, output_dir: Path) -> None:
         """Write generation config for reference."""
         # Extract task_types from task_counts keys
@@ -507,8 +837,9 @@ class DatasetBuilder:
             "task_distributions": self.config.task_distributions,
             "generated_at": datetime.now().isoformat(),
         }
-        with open(output_dir / "config.json", "w") as f:
-            json.dump(config_data, f, indent=2)
+        (output_dir / "config.json").write_bytes(
+            orjson.dumps(config_data, option=orjson.OPT_INDENT_2)
+        )
 
     def build_tests(self) -> Path:
         """Generate test cases.
@@ -529,133 +860,163 @@ class DatasetBuilder:
         if self.config.annotation_enabled:
             annotated_dir.mkdir(exist_ok=True)
 
-        # Generate test cases - stop when we reach test_count
-        test_cases: list[dict[str, Any]] = []
-        raw_test_cases: list[TestCase] = []
-        index = 0
-
         # Get task types to iterate through
         task_types = [t for t in self.config.task_counts.keys() if t in self.tasks]
-        if not task_types:
-            return test_dir
 
-        # Generate test_count tests PER task type
-        for task_type in task_types:
-            if task_type not in self.tasks:
-                continue
-            task = self.tasks[task_type]
-            generated = 0
+        # Records are streamed into test.json as they are produced; if anything
+        # fails the file is removed rather than left as a truncated array
+        with _JsonArrayWriter(test_dir / "test.json") as test_file:
+            if not task_types:
+                return test_dir
+            test_count, to_annotate = self._write_tests(task_types, test_dir, test_file)
 
-            while generated < self.config.test_count:
-                ctx = TaskContext(
-                    rng=self.rng,
-                    index=index,
-                    output_dir=test_dir,
-                    config=task.config,
-                    dataset_name=self.config.name_prefix,
-                )
-                tests = task.generate_tests(ctx)
-                for test_case in tests:
-                    if generated >= self.config.test_count:
-                        break
-                    record = self._test_to_record(test_case, test_dir)
-                    test_cases.append(record)
-                    raw_test_cases.append(test_case)
-                    generated += 1
-                index += 1
+            annotated_dir.mkdir(exist_ok=True)
+            annotation_jobs = [
+                _annotation_job(test_case, expected_action, annotated_dir)
+                for test_case, expected_action in to_annotate.values()
+            ]
+            _run_annotations(annotation_jobs, self.config.workers)
+            annotated_count = len(annotation_jobs)
 
-        # ALWAYS generate 1 annotation per task type for tests (regardless of config)
-        # For grounding tasks, generate 1 annotation per unique element_label
-        annotated_count = 0
-        annotated_dir.mkdir(exist_ok=True)
-
-        # Group indices by task type (and element_label for grounding)
-        indices_by_key: dict[str, list[int]] = {}
-        for idx, test_case in enumerate(raw_test_cases):
-            task_type = test_case.metadata.get("task_type", "unknown")
-            # For grounding tasks, use element_label as additional key
-            if task_type == "grounding":
-                element_label = test_case.metadata.get("element_label", "unknown")
-                key = f"grounding:{element_label}"
-            else:
-                key = task_type
-            if key not in indices_by_key:
-                indices_by_key[key] = []
-            indices_by_key[key].append(idx)
-
-        # Select 1 index per key to annotate
-        indices_to_annotate: set[int] = set()
-        for key, indices in indices_by_key.items():
-            if indices:
-                indices_to_annotate.add(indices[0])
-
-        for idx in sorted(indices_to_annotate):
-            if idx >= len(raw_test_cases):
-                continue
-            test_case = raw_test_cases[idx]
+        if annotated_count > 0:
+            print(f"Generated {test_count} test cases ({annotated_count} annotated)")
+        else:
+            print(f"Generated {test_count} test cases")
+
+        return test_dir
 
-            # Get pixel coordinates for crosshair
-            pixel_coords = test_case.pixel_coords or (0, 0)
+    def _write_tests(
+        self, task_types: list[str], test_dir: Path, test_file: _JsonArrayWriter
+    ) -> tuple[int, dict[str, tuple[TestCase, dict[str, Any]]]]:
+        """Generate test_count tests per task type into test_file.
 
-            # Build tool_calls list from expected_action and any additional actions
-            tool_calls = [test_case.expected_action]
+        Returns:
+            The number of tests written, and the test cases to annotate
+        """
+        test_count = 0
+        # ALWAYS generate 1 annotation per task type for tests (regardless of config)
+        # For grounding tasks, generate 1 annotation per unique element_label.
+        # The first test case seen for each key is kept; the rest are not retained.
+        # Each entry pairs the test case with its normalized expected_action.
+        to_annotate: dict[str, tuple[TestCase, dict[str, Any]]] = {}
+
+        with ExitStack() as stack:
+            executor = None
+            if self.config.workers > 1:
+                executor = stack.enter_context(
+                    ProcessPoolExecutor(
+                        max_workers=self.config.workers,
+                        initializer=_init_worker,
+                        initargs=(self,),
+                    )
+                )
 
-            # Check for additional tool calls in metadata (e.g., type action for textfields)
-            if "additional_tool_calls" in test_case.metadata:
-                tool_calls.extend(test_case.metadata["additional_tool_calls"])
+            for tests in self._iter_test_batches(task_types, test_dir, executor):
+                for record, test_case in tests:
+                    test_file.write(record)
+                    test_count += 1
+                    to_annotate.setdefault(
+                        _annotation_key(test_case), (test_case, record["expected_action"])
+                    )
 
-            # Generate annotated image - include task type in filename
-            task_type = test_case.metadata.get("task_type", "unknown")
-            # For grounding, include element_label in filename
-            if task_type == "grounding":
-                element_label = test_case.metadata.get("element_label", "unknown")
-                annotated_path = annotated_dir / f"{task_type}_{element_label}_{test_case.test_id}_annotated.png"
-            else:
-                annotated_path = annotated_dir / f"{task_type}_{test_case.test_id}_annotated.png"
-
-            # Extract bbox_pixels for grounding tasks (format: [x, y, width, height])
-            bbox_pixels = None
-            if "bbox_pixels" in test_case.metadata:
-                bp = test_case.metadata["bbox_pixels"]
-                bbox_pixels = (bp[0], bp[1], bp[2], bp[3])
-
-            annotate_test_image(
-                image_path=test_case.screenshot,
-                tool_calls=tool_calls,
-                pixel_coords=pixel_coords,
-                prompt=test_case.prompt,
-                output_path=annotated_path,
-                bbox_pixels=bbox_pixels,
-            )
-            annotated_count += 1
+        return test_count, to_annotate
 
-        # Write test.json
-        with open(test_dir / "test.json", "w", encoding="utf-8") as f:
-            json.dump(test_cases, f, indent=2)
+    def _iter_test_batches(
+        self,
+        task_types: list[str],
+        test_dir: Path,
+        executor: ProcessPoolExecutor | None,
+    ) -> Iterator[list[tuple[dict[str, Any], TestCase]]]:
+        """Yield the (record, test case) pairs kept from each rendered index.
+
+        Indices are rendered in waves until test_count tests exist for each
+        task type. Seeds drawn for indices a wave rendered but did not use
+        are handed to the next indices, so index i always gets the i-th seed
+        and the output does not depend on wave sizes or worker count.
+        """
+        index = 0
+        pending_seeds: list[int] = []
+        for task_type in task_types:
+            generated = 0
+            used_indices = 0
+            while generated < self.config.test_count:
+                needed = self._test_wave_size(generated, used_indices)
+                seeds = pending_seeds[:needed]
+                seeds += [self.rng.randrange(2**63) for _ in range(needed - len(seeds))]
+                jobs = [(task_type, index + i, seed, test_dir) for i, seed in enumerate(seeds)]
+
+                wave = self._iter_test_wave(jobs, executor, self.config.test_count - generated)
+                consumed = 0
+                for tests in wave:
+                    consumed += 1
+                    generated += len(tests)
+                    yield tests
+
+                pending_seeds = seeds[consumed:] + pending_seeds[needed:]
+                index += consumed
+                used_indices += consumed
+
+    def _test_wave_size(self, generated: int, used_indices: int) -> int:
+        """Number of indices to render next for a task with generated tests so far.
+
+        The first wave probes with one index per worker; later waves are sized
+        from the tests-per-index seen so far, capped at four per worker.
+        """
+        remaining = self.config.test_count - generated
+        if not used_indices:
+            return min(remaining, self.config.workers)
+        per_index = max(generated / used_indices, 1.0)
+        return min(-int(-remaining // per_index), self.config.workers * 4)
 
-        if annotated_count > 0:
-            print(f"Generated {len(test_cases)} test cases ({annotated_count} annotated)")
+    def _iter_test_wave(
+        self,
+        jobs: list[tuple[str, int, int, Path]],
+        executor: ProcessPoolExecutor | None,
+        remaining: int,
+    ) -> Iterator[list[tuple[dict[str, Any], TestCase]]]:
+        """Render one wave and yield the tests kept from each used index.
+
+        Yields one (possibly truncated) list per used index, in index order.
+        Indices a worker rendered past the last needed test are dropped along
+        with their screenshots; the serial path stops before rendering them.
+        """
+        if executor is not None:
+            results: Iterator[list[tuple[dict[str, Any], TestCase]]] = executor.map(
+                _generate_test_index, jobs
+            )
         else:
-            print(f"Generated {len(test_cases)} test cases")
+            results = (self._generate_test_index(*job) for job in jobs)
 
-        return test_dir
+        for tests in results:
+            if remaining <= 0:
+                # Surplus index rendered by a worker; drop its screenshots
+                for _, test_case in tests:
+                    test_case.screenshot.unlink(missing_ok=True)
+                continue
+            yield tests[:remaining]
+            remaining -= len(tests)
+            if remaining <= 0 and executor is None:
+                break
 
     def _test_to_record(self, test_case: TestCase, test_dir: Path) -> dict[str, Any]:
         """Convert TestCase to record for test.json."""
         # Get image size from metadata if available, default to 1920x1080
         image_size = test_case.metadata.get("image_size", (1920, 1080))
 
-        # Normalize coordinates in expected_action
-        expected_action = test_case.expected_action.copy()
-        if "arguments" in expected_action and "coordinate" in expected_action["arguments"]:
-            pixel_coords = expected_action["arguments"]["coordinate"]
-            if test_case.pixel_coords:
-                pixel_coords = test_case.pixel_coords
+        # Normalize coordinates in expected_action. Only the arguments dict
+        # changes, so only it is copied; test_case itself is left untouched.
+        expected_action = test_case.expected_action
+        arguments = expected_action.get("arguments")
+        if arguments is not None and "coordinate" in arguments:
+            pixel_coords = test_case.pixel_coords or arguments["coordinate"]
             norm_coord = normalize_coord(tuple(pixel_coords), image_size)
-            expected_action["arguments"]["coordinate"] = list(norm_coord)
+            expected_action = {
+                **expected_action,
+                "arguments": {**arguments, "coordinate": list(norm_coord)},
+            }
 
         # Build relative screenshot path (relative to test_dir)
-        screenshot_rel = str(test_case.screenshot.relative_to(test_dir))
+        screenshot_rel = _relative_path(test_case.screenshot, test_dir)
 
         # Tolerance can come from test_case directly or from metadata
         # Convert to list for JSON serialization
@@ -79,6 +79,9 @@ Rules:
 - If finishing, use action=terminate in the tool call."""
 # fmt: on
 
+# Built once and shared read-only by every sample (and preprocessing thread)
+SYSTEM_MESSAGE = {"role": "system", "content": [{"type": "text", "text": SYSTEM_PROMPT}]}
+
 # =============================================================================
 # CENTRALIZED CONFIGURATION
 # =============================================================================
@@ -319,9 +322,7 @@ def preprocess_dataset_impl(dataset_name: str):
         old_conversations = sample["conversations"]
 
         # Inject system prompt (not stored in training data)
-        messages = [
-            {"role": "system", "content": [{"type": "text", "text": SYSTEM_PROMPT}]}
-        ]
+        messages = [SYSTEM_MESSAGE]
 
         # Convert to Qwen-VL format, skipping any system prompts from dataset
         for msg in old_conversations:
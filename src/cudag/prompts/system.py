@@ -24,7 +24,8 @@ def _load_prompt() -> str:
             f"System prompt file not found: {filepath}\n"
             "Run system-prompt/scripts/sync.sh to generate prompt files."
         )
-    return filepath.read_text().strip()
+    # Explicit UTF-8 so the prompt bytes don't depend on the host locale
+    return filepath.read_text(encoding="utf-8").strip()
 
 
 # The canonical system prompt
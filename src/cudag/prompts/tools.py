@@ -442,6 +442,64 @@ def format_tool_call(
     return f"<tool_call>\n{json_str}\n</tool_call>"
 
 
+# Same output as json.dumps() with default settings, without its per-call setup
+_encode_json = json.JSONEncoder().encode
+
+
+def _format_tool_call_direct(
+    tool_call: ToolCall,
+    coordinate: tuple[int, int] | None = None,
+) -> str:
+    """Format a ToolCall without building its to_dict() intermediate.
+
+    Produces exactly the string format_tool_call() would for the same call,
+    composed field by field. This is the per-sample hot path in dataset
+    generation. The field order must track ToolCall.to_dict(), which is why
+    this stays private.
+
+    Args:
+        tool_call: ToolCall to format
+        coordinate: Replacement for the coordinate argument (e.g. RU-normalized),
+            whether it comes from tool_call.coordinate or extra; ignored if the
+            call has no coordinate
+
+    Returns:
+        Formatted <tool_call> string
+    """
+    if tool_call.extra:
+        # extra may shadow or add arbitrary keys (including coordinate); build
+        # the dict exactly as to_dict() does and override whatever ended up there
+        data = tool_call.to_dict()
+        if coordinate is not None and "coordinate" in data["arguments"]:
+            data["arguments"]["coordinate"] = list(coordinate)
+        return format_tool_call(data)
+
+    coord = tool_call.coordinate
+    if coord is not None and coordinate is not None:
+        coord = coordinate
+
+    parts = [f'"action": {_encode_json(tool_call.action)}']
+    if coord is not None:
+        x, y = coord
+        if type(x) is int and type(y) is int:
+            parts.append(f'"coordinate": [{x}, {y}]')
+        else:
+            parts.append(f'"coordinate": {_encode_json(list(coord))}')
+    if tool_call.pixels is not None:
+        parts.append(f'"pixels": {_encode_json(tool_call.pixels)}')
+    if tool_call.keys is not None:
+        parts.append(f'"keys": {_encode_json(tool_call.keys)}')
+    if tool_call.text is not None:
+        parts.append(f'"text": {_encode_json(tool_call.text)}')
+    if tool_call.time is not None:
+        parts.append(f'"time": {_encode_json(tool_call.time)}')
+    if tool_call.status is not None:
+        parts.append(f'"status": {_encode_json(tool_call.status)}')
+
+    arguments = ", ".join(parts)
+    return f'<tool_call>\n{{"name": "computer_use", "arguments": {{{arguments}}}}}\n</tool_call>'
+
+
 # Regex pattern for parsing tool calls
 TOOL_CALL_PATTERN = re.compile(
     r"<tool_call>\s*(?P<json>\{.*?\})\s*</tool_call>",
@@ -0,0 +1,404 @@
+# Copyright (c) 2025 Tylt LLC. All rights reserved.
+# CONFIDENTIAL AND PROPRIETARY. Unauthorized use, copying, or distribution
+# is strictly prohibited. For licensing inquiries: hello@claimhawk.app
+
+"""Tests for dataset.py builder."""
+
+import json
+import tempfile
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import orjson
+import pytest
+from PIL import Image
+
+from cudag.core.dataset import (
+    DatasetBuilder,
+    DatasetConfig,
+    _bounded_map,
+    _JsonArrayWriter,
+    _RecordWriter,
+)
+from cudag.core.task import BaseTask, TaskContext, TaskSample, TestCase
+from cudag.prompts.tools import ToolCall
+
+
+class ClickTask(BaseTask):
+    """Minimal task producing one blank screenshot per sample."""
+
+    task_type = "click"
+
+    def generate_sample(self, ctx: TaskContext) -> TaskSample:
+        image_path = self.save_image(Image.new("RGB", (200, 100), "white"), ctx)
+        x, y = ctx.rng.randint(0, 199), ctx.rng.randint(0, 99)
+        return TaskSample(
+            id=self.build_id(ctx),
+            image_path=image_path,
+            human_prompt="Click it",
+            tool_call=ToolCall.left_click((x, y)),
+            pixel_coords=(x, y),
+            image_size=(200, 100),
+        )
+
+    def generate_test(self, ctx: TaskContext) -> TestCase:
+        image_path = self.save_image(Image.new("RGB", (200, 100), "white"), ctx, prefix="test")
+        x, y = ctx.rng.randint(0, 199), ctx.rng.randint(0, 99)
+        return TestCase(
+            test_id=self.build_id(ctx),
+            screenshot=image_path,
+            prompt="Click it",
+            expected_action=ToolCall.left_click((x, y)).to_dict(),
+            tolerance=(10, 10),
+            metadata={"task_type": "click", "image_size": (200, 100)},
+            pixel_coords=(x, y),
+        )
+
+
+class MultiClickTask(ClickTask):
+    """Task producing three test cases per rendered screenshot."""
+
+    def generate_tests(self, ctx: TaskContext) -> list[TestCase]:
+        # Record each rendered index so tests can count wasted renders
+        (ctx.output_dir / "renders").mkdir(exist_ok=True)
+        (ctx.output_dir / "renders" / str(ctx.index)).touch()
+        first = self.generate_test(ctx)
+        return [
+            first,
+            *(
+                TestCase(
+                    test_id=f"{first.test_id}_{i}",
+                    screenshot=first.screenshot,
+                    prompt=first.prompt,
+                    expected_action=first.expected_action,
+                    tolerance=first.tolerance,
+                    metadata=first.metadata,
+                    pixel_coords=first.pixel_coords,
+                )
+                for i in (1, 2)
+            ),
+        ]
+
+
+class BrokenTestTask(ClickTask):
+    """Task whose test generation fails after the first few indices."""
+
+    def generate_test(self, ctx: TaskContext) -> TestCase:
+        if ctx.index >= 2:
+            raise RuntimeError("render failed")
+        return super().generate_test(ctx)
+
+
+class FailingFile:
+    """File stand-in whose writes fail as if the disk were full."""
+
+    def write(self, data: bytes) -> int:
+        raise OSError(28, "No space left on device")
+
+    def close(self) -> None:
+        pass
+
+
+def _failing_writer(output_dir: Path, splits: list[str]) -> _RecordWriter:
+    writer = _RecordWriter(output_dir, splits)
+    writer._data_file.close()
+    writer._data_file = FailingFile()  # type: ignore[assignment]
+    return writer
+
+
+def _read_ids(path: Path) -> list[str]:
+    with open(path) as f:
+        return [json.loads(line)["id"] for line in f]
+
+
+def _build(output_dir: Path, count: int = 40, **kwargs: object) -> Path:
+    config = DatasetConfig(
+        name_prefix="test",
+        task_counts={"click": count},
+        output_dir=output_dir,
+        **kwargs,  # type: ignore[arg-type]
+    )
+    return DatasetBuilder(config, [ClickTask({}, None)]).build()
+
+
+class TestDatasetBuild:
+    """Tests for DatasetBuilder.build."""
+
+    def test_splits_partition_data(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            out = _build(Path(tmpdir) / "ds", held_out_enabled=True, held_out_ratio=0.2)
+            data = _read_ids(out / "data.jsonl")
+            train = _read_ids(out / "train.jsonl")
+            val = _read_ids(out / "val.jsonl")
+            held_out = _read_ids(out / "held_out.jsonl")
+
+            assert len(data) == 40
+            assert sorted(train + val + held_out) == sorted(data)
+            assert train and val and held_out
+
+    def test_split_is_deterministic(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            first = _build(Path(tmpdir) / "a")
+            second = _build(Path(tmpdir) / "b")
+            assert _read_ids(first / "train.jsonl") == _read_ids(second / "train.jsonl")
+            assert _read_ids(first / "val.jsonl") == _read_ids(second / "val.jsonl")
+
+    def test_no_held_out_file_when_disabled(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            out = _build(Path(tmpdir) / "ds")
+            assert not (out / "held_out.jsonl").exists()
+            assert (out / "config.json").exists()
+
+    def test_workers_match_serial_output(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            serial = _build(Path(tmpdir) / "serial")
+            parallel = _build(Path(tmpdir) / "parallel", workers=2)
+            for name in ("data.jsonl", "train.jsonl", "val.jsonl"):
+                assert (serial / name).read_bytes() == (parallel / name).read_bytes()
+
+
+class TestBoundedMap:
+    """Tests for the bounded-submission executor map."""
+
+    def test_limits_jobs_in_flight(self) -> None:
+        pulled: list[int] = []
+
+        def jobs() -> Iterator[int]:
+            for i in range(100):
+                pulled.append(i)
+                yield i
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = _bounded_map(executor, lambda x: x * 2, jobs(), 4)  # type: ignore[arg-type]
+            assert next(results) == 0
+            # The initial window plus one refill, not the whole job range
+            assert len(pulled) == 5
+            assert list(results) == [x * 2 for x in range(1, 100)]
+
+
+class TestBuildTests:
+    """Tests for DatasetBuilder.build_tests."""
+
+    def _build_tests(
+        self, output_dir: Path, workers: int = 1, task: BaseTask | None = None
+    ) -> Path:
+        config = DatasetConfig(
+            name_prefix="test",
+            task_counts={"click": 1},
+            output_dir=output_dir,
+            test_count=6,
+            workers=workers,
+        )
+        return DatasetBuilder(config, [task or ClickTask({}, None)]).build_tests()
+
+    def test_writes_test_count_cases(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            test_dir = self._build_tests(Path(tmpdir))
+            cases = json.loads((test_dir / "test.json").read_text())
+            assert len(cases) == 6
+            assert len(list((test_dir / "images").iterdir())) == 6
+
+    def test_workers_match_serial_output(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            serial = self._build_tests(Path(tmpdir) / "serial")
+            parallel = self._build_tests(Path(tmpdir) / "parallel", workers=2)
+            assert (serial / "test.json").read_bytes() == (parallel / "test.json").read_bytes()
+
+    @pytest.mark.parametrize("workers", [1, 2, 4])
+    def test_multiple_tests_per_screen(self, workers: int) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            serial = self._build_tests(Path(tmpdir) / "serial", task=MultiClickTask({}, None))
+            test_dir = self._build_tests(
+                Path(tmpdir) / "parallel", workers=workers, task=MultiClickTask({}, None)
+            )
+            cases = json.loads((test_dir / "test.json").read_text())
+            assert len(cases) == 6
+            assert len(list((test_dir / "images").iterdir())) == 2
+            # Waves are sized from observed tests per screen, so a parallel
+            # build renders at most one extra index per worker
+            assert len(list((test_dir / "renders").iterdir())) <= 2 + workers
+            assert (serial / "test.json").read_bytes() == (test_dir / "test.json").read_bytes()
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_failure_leaves_no_partial_test_file(self, workers: int) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_dir = Path(tmpdir)
+            with pytest.raises(RuntimeError, match="render failed"):
+                self._build_tests(output_dir, workers=workers, task=BrokenTestTask({}, None))
+            assert not (output_dir / "test" / "test.json").exists()
+
+
+class TestToRecord:
+    """Tests for DatasetBuilder._to_record."""
+
+    def test_metadata_layout(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = DatasetConfig(name_prefix="test", output_dir=Path(tmpdir))
+            builder = DatasetBuilder(config, [])
+            sample = TaskSample(
+                id="test_00000",
+                image_path=Path(tmpdir) / "images" / "test_00000.png",
+                human_prompt="Click it",
+                tool_call=ToolCall.left_click((100, 50)),
+                pixel_coords=(100, 50),
+                image_size=(200, 100),
+                metadata={"extra": 1, "task_type": "click"},
+            )
+            record = builder._to_record(sample)
+
+            assert record["image"] == "images/test_00000.png"
+            assert list(record["metadata"]) == ["task_type", "real_coords", "extra"]
+            assert record["metadata"]["task_type"] == "click"
+            assert '"coordinate": [500, 500]' in record["conversations"][1]["value"]
+
+    @pytest.mark.parametrize(
+        "tool_call",
+        [
+            ToolCall(action="left_click", extra={"coordinate": [100, 50]}),
+            ToolCall(action="left_click", coordinate=(1, 2), extra={"coordinate": [100, 50]}),
+        ],
+    )
+    def test_normalizes_extra_coordinate(self, tool_call: ToolCall) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = DatasetConfig(name_prefix="test", output_dir=Path(tmpdir))
+            sample = TaskSample(
+                id="test_00000",
+                image_path=Path(tmpdir) / "test_00000.png",
+                human_prompt="Click it",
+                tool_call=tool_call,
+                pixel_coords=(100, 50),
+                image_size=(200, 100),
+            )
+            record = DatasetBuilder(config, [])._to_record(sample)
+            value = record["conversations"][1]["value"]
+            assert '"coordinate": [500, 500]' in value
+            assert "[100, 50]" not in value
+
+    def test_missing_task_type(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = DatasetConfig(name_prefix="test", output_dir=Path(tmpdir))
+            sample = TaskSample(
+                id="test_00000",
+                image_path=Path(tmpdir) / "test_00000.png",
+                human_prompt="Wait",
+                tool_call=ToolCall.wait(1.0),
+                pixel_coords=(0, 0),
+            )
+            record = DatasetBuilder(config, [])._to_record(sample)
+            assert record["metadata"]["task_type"] == "unknown"
+
+
+class TestRecordWriter:
+    """Tests for the background jsonl writer."""
+
+    def test_write_error_is_reraised(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            writer = _failing_writer(Path(tmpdir), ["train", "val"])
+            writer.put([("train", b"{}\n")])
+            with pytest.raises(OSError, match="No space left"):
+                writer.close()
+
+    def test_put_reraises_after_failure(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            writer = _failing_writer(Path(tmpdir), ["train", "val"])
+            with pytest.raises(OSError, match="No space left"):
+                # Keep feeding until the writer thread reports the failure
+                for _ in range(100_000):
+                    writer.put([("train", b"{}\n")])
+            with pytest.raises(OSError):
+                writer.close()
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_build_stops_on_write_error(
+        self, monkeypatch: pytest.MonkeyPatch, workers: int
+    ) -> None:
+        monkeypatch.setattr("cudag.core.dataset._RecordWriter", _failing_writer)
+        errors: list[BaseException] = []
+
+        def run(output_dir: Path) -> None:
+            try:
+                _build(output_dir, count=400, workers=workers)
+            except BaseException as e:
+                errors.append(e)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_dir = Path(tmpdir) / "ds"
+            thread = threading.Thread(target=run, args=(output_dir,), daemon=True)
+            thread.start()
+            thread.join(timeout=30)
+            assert not thread.is_alive(), "build() hung after a write error"
+            assert len(errors) == 1
+            assert isinstance(errors[0], OSError)
+            # Queued indices are dropped rather than rendered to completion
+            assert len(list((output_dir / "images").iterdir())) < 50
+
+    def test_build_stops_on_checkpoint_error(self) -> None:
+        def checkpoint(count: int) -> None:
+            raise RuntimeError("checkpoint failed")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = DatasetConfig(
+                name_prefix="test",
+                task_counts={"click": 400},
+                output_dir=Path(tmpdir) / "ds",
+                workers=2,
+            )
+            builder = DatasetBuilder(config, [ClickTask({}, None)])
+            with pytest.raises(RuntimeError, match="checkpoint failed"):
+                builder.build(checkpoint_callback=checkpoint, checkpoint_interval=1)
+            assert len(list((Path(tmpdir) / "ds" / "images").iterdir())) < 50
+
+
+class TestJsonArrayWriter:
+    """Tests for the streaming test.json writer."""
+
+    @pytest.mark.parametrize(
+        "records",
+        [
+            [],
+            [{"test_id": "a"}],
+            [{"test_id": "a", "tolerance": [10, 10], "metadata": {"note": "x\ny"}}, {"b": []}],
+        ],
+    )
+    def test_matches_orjson_indent(self, records: list[dict[str, object]]) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "test.json"
+            writer = _JsonArrayWriter(path)
+            for record in records:
+                writer.write(record)  # type: ignore[arg-type]
+            writer.close()
+            assert path.read_bytes() == orjson.dumps(records, option=orjson.OPT_INDENT_2)
+
+    def test_error_removes_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "test.json"
+            with pytest.raises(RuntimeError):
+                with _JsonArrayWriter(path) as writer:
+                    writer.write({"test_id": "a"})
+                    raise RuntimeError("boom")
+            assert not path.exists()
+
+
+class TestTestToRecord:
+    """Tests for DatasetBuilder._test_to_record."""
+
+    def test_normalizes_without_mutating_test_case(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            test_dir = Path(tmpdir)
+            config = DatasetConfig(name_prefix="test", output_dir=test_dir)
+            test_case = TestCase(
+                test_id="test_00000",
+                screenshot=test_dir / "images" / "test_00000.png",
+                prompt="Click it",
+                expected_action=ToolCall.left_click((100, 50)).to_dict(),
+                tolerance=10,
+                metadata={"image_size": (200, 100)},
+                pixel_coords=(100, 50),
+            )
+            record = DatasetBuilder(config, [])._test_to_record(test_case, test_dir)
+
+            assert record["expected_action"]["arguments"]["coordinate"] == [500, 500]
+            assert test_case.expected_action["arguments"]["coordinate"] == [100, 50]
+            assert record["tolerance"] == [10, 10]
@@ -12,6 +12,7 @@ from cudag.prompts.tools import (
     TextVerificationCall,
     ToolCall,
     VerificationRegion,
+    _format_tool_call_direct,
     format_tool_call,
     parse_tool_call,
     validate_tool_call,
@@ -141,6 +142,45 @@ class TestFormatToolCall:
         assert '"pixels": 300' in result
 
 
+class TestFormatToolCallDirect:
+    """Tests for _format_tool_call_direct function."""
+
+    @pytest.mark.parametrize(
+        "tc",
+        [
+            ToolCall.left_click((500, 300)),
+            ToolCall.scroll((400, 200), -300),
+            ToolCall.key_press(["ctrl", "c"]),
+            ToolCall.type_text('say "hi"\n'),
+            ToolCall.wait(1.0),
+            ToolCall.terminate(),
+            ToolCall(action="left_click", coordinate=(1.5, 2), extra={"button": "left"}),
+        ],
+    )
+    def test_matches_format_tool_call(self, tc: ToolCall) -> None:
+        assert _format_tool_call_direct(tc) == format_tool_call(tc)
+
+    def test_coordinate_override(self) -> None:
+        tc = ToolCall.left_click((1920, 1080))
+        result = _format_tool_call_direct(tc, (1000, 1000))
+        assert result == format_tool_call(ToolCall.left_click((1000, 1000)))
+
+    def test_override_applies_to_extra_coordinate(self) -> None:
+        tc = ToolCall(action="left_click", extra={"coordinate": [100, 50]})
+        result = _format_tool_call_direct(tc, (500, 500))
+        assert '"coordinate": [500, 500]' in result
+
+    def test_override_wins_over_extra_and_field_coordinate(self) -> None:
+        tc = ToolCall(action="left_click", coordinate=(1, 2), extra={"coordinate": [100, 50]})
+        result = _format_tool_call_direct(tc, (500, 500))
+        assert '"coordinate": [500, 500]' in result
+        assert "[100, 50]" not in result
+
+    def test_override_ignored_without_coordinate(self) -> None:
+        tc = ToolCall.key_press(["enter"])
+        assert _format_tool_call_direct(tc, (10, 10)) == format_tool_call(tc)
+
+
 class TestParseToolCall:
     """Tests for parse_tool_call function."""
 